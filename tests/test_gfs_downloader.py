@@ -1,9 +1,35 @@
+import gzip
+import io
 import os
+import threading
+import time
 from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 import pytest
+from botocore.exceptions import ClientError
 
-from zonaite.forecast import download_gfs_data
+from zonaite.forecast import download_gfs_batch, download_gfs_data, iter_gfs_data
+from zonaite.forecast import gfs
+from zonaite.forecast.gfs import GribIdx, download_idx, download_multi_range_to_file
+
+IDX_CONTENT = (
+    b"1:0:d=2025010100:PRMSL:mean sea level:anl:\n"
+    b"2:100:d=2025010100:TMP:2 m above ground:anl:\n"
+    b"3:250:d=2025010100:APCP:surface:0-3 hour acc fcst:\n"
+    b"4:300:d=2025010100:UGRD:10 m above ground:anl:\n"
+    b"5:420:d=2025010100:APCP:surface:0-6 hour acc fcst:\n"
+    b"6:500:d=2025010100:VGRD:10 m above ground:anl:\n"
+)
+GRIB_CONTENT = bytes(range(256)) * 2
+
+
+@pytest.fixture(autouse=True)
+def idx_cache_dir(tmp_path, monkeypatch):
+    """将 idx 缓存目录指向临时目录，避免写入用户的缓存"""
+    cache_dir = tmp_path / "idx_cache"
+    monkeypatch.setenv("ZONAITE_IDX_CACHE_DIR", str(cache_dir))
+    return cache_dir
 
 
 @pytest.fixture
@@ -24,6 +50,154 @@ def test_output_dir(tmp_path):
     return output_dir
 
 
+def test_grib_idx_find_elements():
+    """测试 idx 文件的解析与要素查找"""
+    grib_idx = GribIdx(IDX_CONTENT)
+
+    # 最后一条记录缺少结束位置，不会被解析
+    assert len(grib_idx.elements) == 5
+
+    found = grib_idx.find_elements(
+        [
+            {"name": "UGRD", "level": "10 m above ground"},
+            {"name": "TMP", "level": "2 m above ground"},
+            {"name": "APCP", "level": "surface"},
+            {"name": "INVALID", "level": "surface"},
+        ]
+    )
+
+    # 按请求顺序返回，同名同层次的记录全部返回
+    assert [(e.variable, e.start_byte, e.end_byte) for e in found] == [
+        ("UGRD", 300, 420),
+        ("TMP", 100, 250),
+        ("APCP", 250, 300),
+        ("APCP", 420, 500),
+    ]
+
+    # 仍然支持字符串形式的 idx 内容
+    assert GribIdx(IDX_CONTENT.decode("utf-8")).elements == grib_idx.elements
+
+
+class CountingS3Client:
+    """返回固定 idx 内容并记录请求次数的 S3 客户端"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_object(self, Bucket, Key):
+        self.calls += 1
+        return {"Body": io.BytesIO(IDX_CONTENT)}
+
+
+def test_download_idx_cache(tmp_path):
+    """测试 idx 文件的本地缓存"""
+    s3_client = CountingS3Client()
+    cache_path = tmp_path / "noaa-gfs-bdp-pds" / "20250101_00_000.idx"
+
+    for _ in range(2):
+        idx_content = download_idx(
+            s3_client, "noaa-gfs-bdp-pds", "gfs.t00z.pgrb2.0p25.f000.idx", cache_path
+        )
+        assert idx_content == IDX_CONTENT
+
+    # 第二次读取命中缓存，不再发起请求
+    assert s3_client.calls == 1
+    assert cache_path.read_bytes() == IDX_CONTENT
+
+
+def test_download_idx_read_only_cache(tmp_path, monkeypatch):
+    """测试只读或无法读取的 idx 缓存不会导致下载失败"""
+    cache_path = tmp_path / "noaa-gfs-bdp-pds" / "20250101_00_000.idx"
+    cache_path.parent.mkdir()
+    cache_path.write_bytes(IDX_CONTENT)
+
+    def raise_permission_error(*args, **kwargs):
+        raise PermissionError(13, "Permission denied")
+
+    # 无法更新修改时间时仍然使用缓存
+    s3_client = CountingS3Client()
+    monkeypatch.setattr(os, "utime", raise_permission_error)
+    idx_content = download_idx(s3_client, "noaa-gfs-bdp-pds", "a.idx", cache_path)
+    assert idx_content == IDX_CONTENT
+    assert s3_client.calls == 0
+
+    # 无法读取缓存时重新下载，写入缓存失败也不影响结果
+    monkeypatch.setattr(type(cache_path), "read_bytes", raise_permission_error)
+    monkeypatch.setattr(gfs.tempfile, "mkstemp", raise_permission_error)
+    idx_content = download_idx(s3_client, "noaa-gfs-bdp-pds", "a.idx", cache_path)
+    assert idx_content == IDX_CONTENT
+    assert s3_client.calls == 1
+
+
+def test_idx_cache_eviction(idx_cache_dir, monkeypatch):
+    """测试 idx 缓存只淘汰自己写入的文件"""
+    monkeypatch.setattr(gfs, "IDX_CACHE_MAX_FILES", 2)
+    bucket_dir = idx_cache_dir / "noaa-gfs-bdp-pds"
+    bucket_dir.mkdir(parents=True)
+
+    # 缓存目录中已有的其他 idx 文件（例如 GRIB 数据归档）
+    foreign_path = bucket_dir / "gfs.t00z.pgrb2.0p25.f000.idx"
+    foreign_path.write_bytes(IDX_CONTENT)
+    os.utime(foreign_path, (0, 0))
+
+    s3_client = CountingS3Client()
+    for forecast_hour in range(3):
+        cache_path = gfs._idx_cache_path(
+            "noaa-gfs-bdp-pds", datetime(2025, 1, 1), forecast_hour
+        )
+        download_idx(s3_client, "noaa-gfs-bdp-pds", "a.idx", cache_path)
+        os.utime(cache_path, (forecast_hour + 1, forecast_hour + 1))
+
+    # 最久未使用的缓存文件被删除，其他文件保持不变
+    assert sorted(path.name for path in bucket_dir.iterdir()) == [
+        "20250101_00_001.idx",
+        "20250101_00_002.idx",
+        "gfs.t00z.pgrb2.0p25.f000.idx",
+    ]
+
+
+class CompressedS3Client:
+    """只在存在压缩副本时返回 gzip 压缩 idx 的 S3 客户端"""
+
+    def __init__(self, missing_gz_error):
+        self.missing_gz_error = missing_gz_error
+        self.keys = []
+
+    def get_object(self, Bucket, Key):
+        self.keys.append(Key)
+        if Key.endswith(".gz"):
+            if self.missing_gz_error is not None:
+                raise ClientError(
+                    {"Error": {"Code": self.missing_gz_error, "Message": ""}},
+                    "GetObject",
+                )
+            return {"Body": io.BytesIO(gzip.compress(IDX_CONTENT))}
+        return {"Body": io.BytesIO(IDX_CONTENT)}
+
+
+@pytest.mark.parametrize(
+    "missing_gz_error, expected_keys",
+    [
+        (None, ["a.idx.gz"]),
+        ("NoSuchKey", ["a.idx.gz", "a.idx"]),
+        # 不允许公开列举的桶对不存在的对象返回 403
+        ("AccessDenied", ["a.idx.gz", "a.idx"]),
+    ],
+)
+def test_download_idx_compressed(monkeypatch, missing_gz_error, expected_keys):
+    """测试压缩 idx 文件的下载及回退"""
+    monkeypatch.setattr(gfs, "COMPRESSED_IDX_BUCKETS", {"mirror"})
+    s3_client = CompressedS3Client(missing_gz_error)
+
+    assert download_idx(s3_client, "mirror", "a.idx") == IDX_CONTENT
+    assert s3_client.keys == expected_keys
+
+    # 未配置压缩副本的桶直接下载原始 idx 文件
+    s3_client = CompressedS3Client(missing_gz_error)
+    assert download_idx(s3_client, "noaa-gfs-bdp-pds", "a.idx") == IDX_CONTENT
+    assert s3_client.keys == ["a.idx"]
+
+
 def test_download_success(test_elements, test_output_dir):
     """测试成功下载数据的情况"""
     # 使用固定的时间进行测试
@@ -55,6 +229,20 @@ def test_download_success(test_elements, test_output_dir):
     assert os.path.exists(output_path)
     assert os.path.getsize(output_path) > 0
 
+    # 检查每个要素在文件中的偏移量和长度
+    assert result.element_offsets is not None
+    assert set(result.element_offsets) == {
+        (element["name"], element["level"]) for element in test_elements
+    }
+    offset = 0
+    for element in test_elements:
+        element_offset, length = result.element_offsets[
+            (element["name"], element["level"])
+        ]
+        assert element_offset == offset
+        offset += length
+    assert offset == os.path.getsize(output_path)
+
 
 def test_download_invalid_elements(test_output_dir):
     """测试无效的气象要素"""
@@ -120,6 +308,28 @@ def test_download_invalid_forecast_hour(test_elements, test_output_dir):
     assert result.error_message is not None
 
 
+def test_download_invalid_cycle(test_elements, test_output_dir):
+    """测试无效的起报时次"""
+    end_dt = datetime.now(timezone.utc) - timedelta(days=1)
+    start_dt = end_dt.replace(hour=3, minute=0, second=0, microsecond=0)
+    forecast_hour = 0
+    output_path = os.path.join(test_output_dir, "gfs_invalid_cycle.grib2")
+
+    result = download_gfs_data(
+        init_dt=start_dt,
+        forecast_hour=forecast_hour,
+        elements=test_elements,
+        output_path=output_path,
+        quiet=True,
+    )
+
+    # 检查下载结果，无效请求不会创建文件
+    assert not result.success
+    assert result.error_message is not None
+    assert "Invalid cycle" in result.error_message
+    assert not os.path.exists(output_path)
+
+
 def test_download_multiple_elements(test_output_dir):
     """测试下载多个气象要素"""
     elements = [
@@ -201,3 +411,447 @@ def test_download_custom_bucket_and_region(test_elements, test_output_dir):
     assert result.success
     assert result.file_path == output_path
     assert result.file_size_mb is not None and result.file_size_mb > 0
+
+
+def test_download_batch(test_elements, test_output_dir):
+    """测试批量下载多个预报时效"""
+    end_dt = datetime.now(timezone.utc) - timedelta(days=1)
+    start_dt = end_dt.replace(hour=0, minute=0, second=0, microsecond=0)
+    forecast_hours = [0, 3, 6]
+    requests = [
+        {
+            "init_dt": start_dt,
+            "forecast_hour": forecast_hour,
+            "elements": test_elements,
+            "output_path": os.path.join(
+                test_output_dir, f"gfs_batch_{forecast_hour:03d}.grib2"
+            ),
+        }
+        for forecast_hour in forecast_hours
+    ]
+
+    results = download_gfs_batch(requests, quiet=True)
+
+    # 检查下载结果，结果顺序与请求顺序一致
+    assert len(results) == len(requests)
+    for request, result in zip(requests, results):
+        assert result.success
+        assert result.forecast_hour == request["forecast_hour"]
+        assert result.file_path == request["output_path"]
+        assert os.path.exists(request["output_path"])
+        assert os.path.getsize(request["output_path"]) > 0
+
+
+def test_iter_gfs_data(test_elements):
+    """测试逐个返回下载完成的气象要素"""
+    end_dt = datetime.now(timezone.utc) - timedelta(days=1)
+    start_dt = end_dt.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    results = list(iter_gfs_data(start_dt, 0, test_elements, quiet=True))
+
+    # 每个要素返回一次，数据长度与 idx 中的字节范围一致
+    assert {(elem.variable, elem.level) for elem, _ in results} == {
+        (element["name"], element["level"]) for element in test_elements
+    }
+    for elem, data in results:
+        assert len(data) == elem.end_byte - elem.start_byte
+        assert data[:4] == b"GRIB"
+
+
+class FakeGribS3Client:
+    """返回固定 idx 与 grib2 内容并记录字节范围请求的 S3 客户端"""
+
+    def __init__(self):
+        self.ranges = []
+        self.lock = threading.Lock()
+
+    def get_object(self, Bucket, Key, Range=None):
+        if Key.endswith(".idx"):
+            return {"Body": io.BytesIO(IDX_CONTENT)}
+        first, last = map(int, Range.split("=")[1].split("-"))
+        end = last + 1
+        with self.lock:
+            self.ranges.append((first, end))
+        return {"Body": io.BytesIO(GRIB_CONTENT[first:end])}
+
+
+def test_iter_gfs_data_subranges(monkeypatch):
+    """测试逐个返回要素时大范围被拆分为子范围请求"""
+    s3_client = FakeGribS3Client()
+    monkeypatch.setattr(gfs, "_get_s3_client", lambda region: s3_client)
+    monkeypatch.setattr(gfs, "SUBRANGE_THRESHOLD", 64)
+    monkeypatch.setattr(gfs, "SUBRANGE_SIZE", 64)
+    elements = [
+        {"name": "UGRD", "level": "10 m above ground"},
+        {"name": "TMP", "level": "2 m above ground"},
+        {"name": "APCP", "level": "surface"},
+    ]
+
+    results = list(
+        iter_gfs_data(
+            datetime(2025, 1, 1, tzinfo=timezone.utc), 0, elements, quiet=True
+        )
+    )
+
+    # 每个要素的数据完整，合并后的范围被拆分为 64 字节的子范围
+    assert sorted((elem.start_byte, elem.end_byte) for elem, _ in results) == [
+        (100, 250),
+        (250, 300),
+        (300, 420),
+        (420, 500),
+    ]
+    for elem, data in results:
+        start, end = elem.start_byte, elem.end_byte
+        assert data == GRIB_CONTENT[start:end]
+    assert sorted(s3_client.ranges) == [
+        (100, 164),
+        (164, 228),
+        (228, 292),
+        (292, 356),
+        (356, 420),
+        (420, 484),
+        (484, 500),
+    ]
+
+
+MULTI_RANGE_BOUNDARY = b"zonaite-boundary"
+# 数据中包含分隔符，解析时不能按分隔符切分数据
+MULTI_RANGE_CONTENT = (
+    b"\r\n--" + MULTI_RANGE_BOUNDARY + b"\r\n\r\n" + bytes(range(40))
+) * 4
+
+
+class MultiRangeHandler(BaseHTTPRequestHandler):
+    """按 Range 头返回 multipart/byteranges 响应或完整对象的 HTTP 处理器"""
+
+    multipart = True
+    truncated = False
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if not self.multipart:
+            # 与 Amazon S3 一样忽略多范围请求，返回完整对象
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(MULTI_RANGE_CONTENT)))
+            self.end_headers()
+            try:
+                self.wfile.write(MULTI_RANGE_CONTENT)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            return
+
+        body = b""
+        for spec in self.headers["Range"].split("=")[1].split(","):
+            first, last = map(int, spec.split("-"))
+            end = last + 1
+            content_range = f"bytes {first}-{last}/{len(MULTI_RANGE_CONTENT)}"
+            body += b"--" + MULTI_RANGE_BOUNDARY + b"\r\n"
+            body += b"Content-Type: application/octet-stream\r\n"
+            body += f"Content-Range: {content_range}\r\n\r\n".encode()
+            body += MULTI_RANGE_CONTENT[first:end] + b"\r\n"
+        body += b"--" + MULTI_RANGE_BOUNDARY + b"--\r\n"
+        if self.truncated:
+            # 连接提前断开，最后一个部分缺少数据
+            body = body[: body.rfind(b"\r\n--") - 5]
+
+        content_type = "multipart/byteranges; boundary=" + MULTI_RANGE_BOUNDARY.decode()
+        self.send_response(206)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def multi_range_server():
+    """启动本地 HTTP 服务器"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MultiRangeHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class PresignedUrlClient:
+    """生成指向本地 HTTP 服务器的对象地址的 S3 客户端"""
+
+    def __init__(self, port):
+        self.port = port
+
+    def generate_presigned_url(self, ClientMethod, Params):
+        return f"http://127.0.0.1:{self.port}/{Params['Bucket']}/{Params['Key']}"
+
+
+@pytest.mark.parametrize("multipart", [True, False])
+def test_download_multi_range_to_file(
+    tmp_path, monkeypatch, multi_range_server, multipart
+):
+    """测试多范围请求的响应解析及不支持时的回退"""
+    monkeypatch.setattr(MultiRangeHandler, "multipart", multipart)
+    s3_client = PresignedUrlClient(multi_range_server.server_address[1])
+    range_requests = [
+        (10, 40, [(10, 20, 0), (30, 40, 10)]),
+        (100, 150, [(100, 150, 20)]),
+    ]
+    output_path = tmp_path / "gfs_multi_range.grib2"
+    output_path.write_bytes(bytes(70))
+
+    written = download_multi_range_to_file(
+        s3_client, "bucket", "key", range_requests, str(output_path), quiet=True
+    )
+
+    if multipart:
+        # 每个部分按 Content-Range 写入各自的位置
+        assert written == 70
+        assert output_path.read_bytes() == b"".join(
+            [
+                MULTI_RANGE_CONTENT[10:20],
+                MULTI_RANGE_CONTENT[30:40],
+                MULTI_RANGE_CONTENT[100:150],
+            ]
+        )
+    else:
+        # 服务器返回完整对象时不写入任何数据，由调用方回退到单范围请求
+        assert written is None
+        assert output_path.read_bytes() == bytes(70)
+
+
+def test_download_multi_range_to_file_truncated(
+    tmp_path, monkeypatch, multi_range_server
+):
+    """测试多范围响应中被截断的部分"""
+    monkeypatch.setattr(MultiRangeHandler, "truncated", True)
+    s3_client = PresignedUrlClient(multi_range_server.server_address[1])
+    range_requests = [
+        (10, 40, [(10, 40, 0)]),
+        (100, 150, [(100, 150, 30)]),
+    ]
+    output_path = tmp_path / "gfs_multi_range.grib2"
+    output_path.write_bytes(bytes(80))
+
+    with pytest.raises(IOError, match="truncated part"):
+        download_multi_range_to_file(
+            s3_client, "bucket", "key", range_requests, str(output_path), quiet=True
+        )
+
+    # 不完整的响应不写入任何数据
+    assert output_path.read_bytes() == bytes(80)
+
+
+def test_merge_byte_ranges():
+    """测试相邻字节范围的合并"""
+    spans = gfs._merge_byte_ranges(
+        [(400, 500), (0, 100), (150, 200), (200, 260)], max_gap=50
+    )
+
+    # 间隔不超过 max_gap 的范围合并为一个请求，成员为原列表中的下标
+    assert spans == [(0, 260, [1, 2, 3]), (400, 500, [0])]
+
+
+def test_split_span(monkeypatch):
+    """测试大范围拆分为子范围"""
+    monkeypatch.setattr(gfs, "SUBRANGE_THRESHOLD", 100)
+    monkeypatch.setattr(gfs, "SUBRANGE_SIZE", 100)
+
+    # 不超过阈值的范围保持不变
+    assert gfs._split_span(0, 100, [(0, 100, 0)]) == [(0, 100, [(0, 100, 0)])]
+
+    # 子范围内的部分被截断，输出位置随之偏移；子范围缩小到其中的部分，
+    # 只覆盖间隔的子范围被跳过
+    assert gfs._split_span(0, 350, [(0, 50, 0), (260, 350, 50)]) == [
+        (0, 50, [(0, 50, 0)]),
+        (260, 300, [(260, 300, 50)]),
+        (300, 350, [(300, 350, 90)]),
+    ]
+
+
+def test_download_span_to_file(tmp_path):
+    """测试按输出位置写入范围内的各部分并跳过间隔"""
+    s3_client = FakeGribS3Client()
+    output_path = tmp_path / "gfs_span.grib2"
+    output_path.write_bytes(bytes(270))
+
+    written = gfs.download_span_to_file(
+        s3_client,
+        "noaa-gfs-bdp-pds",
+        "gfs.t00z.pgrb2.0p25.f000",
+        100,
+        420,
+        [(100, 250, 120), (300, 420, 0)],
+        str(output_path),
+        quiet=True,
+    )
+
+    assert written == 270
+    assert s3_client.ranges == [(100, 420)]
+    assert output_path.read_bytes() == GRIB_CONTENT[300:420] + GRIB_CONTENT[100:250]
+
+
+def test_place_chunk():
+    """测试 CRT 数据块按对象偏移量写入各部分"""
+    parts = [(100, 250, 120), (300, 420, 0)]
+    output = bytearray(270)
+
+    # 数据块乱序到达，并且跨越部分之间的间隔
+    for chunk_start, chunk_end in [(280, 420), (100, 180), (180, 280)]:
+        chunk = GRIB_CONTENT[chunk_start:chunk_end]
+        for output_offset, data in gfs._place_chunk(chunk, chunk_start, parts):
+            output_end = output_offset + len(data)
+            output[output_offset:output_end] = data
+
+    assert bytes(output) == GRIB_CONTENT[300:420] + GRIB_CONTENT[100:250]
+
+    # 只覆盖间隔的数据块不产生写入
+    assert gfs._place_chunk(GRIB_CONTENT[250:300], 250, parts) == []
+
+
+def test_download_gfs_data_layout(tmp_path, monkeypatch):
+    """测试要素按请求顺序写入文件及其偏移量"""
+    s3_client = FakeGribS3Client()
+    monkeypatch.setattr(gfs, "_get_s3_client", lambda region: s3_client)
+    monkeypatch.setattr(gfs, "USE_CRT", False)
+    monkeypatch.setattr(gfs, "SUBRANGE_THRESHOLD", 64)
+    monkeypatch.setattr(gfs, "SUBRANGE_SIZE", 64)
+    elements = [
+        {"name": "UGRD", "level": "10 m above ground"},
+        {"name": "TMP", "level": "2 m above ground"},
+        {"name": "APCP", "level": "surface"},
+        # 重复的要素只写入一次
+        {"name": "TMP", "level": "2 m above ground"},
+    ]
+    output_path = tmp_path / "gfs_layout.grib2"
+
+    result = download_gfs_data(
+        datetime(2025, 1, 1, tzinfo=timezone.utc),
+        0,
+        elements,
+        str(output_path),
+        quiet=True,
+    )
+
+    assert result.success
+    assert output_path.read_bytes() == b"".join(
+        [
+            GRIB_CONTENT[300:420],
+            GRIB_CONTENT[100:250],
+            GRIB_CONTENT[250:300],
+            GRIB_CONTENT[420:500],
+        ]
+    )
+    # 同名同层次的多条记录只记录第一条的位置
+    assert result.element_offsets == {
+        ("UGRD", "10 m above ground"): (0, 120),
+        ("TMP", "2 m above ground"): (120, 150),
+        ("APCP", "surface"): (270, 50),
+    }
+    # 相邻的范围合并为一个请求后再拆分为子范围
+    assert sorted(s3_client.ranges) == [
+        (start, min(start + 64, 500)) for start in range(100, 500, 64)
+    ]
+
+
+class ConcurrencyTrackingS3Client(FakeGribS3Client):
+    """记录同时进行的请求数的 S3 客户端"""
+
+    def __init__(self):
+        super().__init__()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def get_object(self, Bucket, Key, Range=None):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(0.005)
+            return super().get_object(Bucket, Key, Range)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+def test_download_batch_connection_limit(tmp_path, monkeypatch):
+    """测试批量下载的并发请求数不超过连接池大小"""
+    s3_client = ConcurrencyTrackingS3Client()
+    monkeypatch.setattr(gfs, "_get_s3_client", lambda region: s3_client)
+    monkeypatch.setattr(gfs, "USE_CRT", False)
+    monkeypatch.setattr(gfs, "SUBRANGE_THRESHOLD", 8)
+    monkeypatch.setattr(gfs, "SUBRANGE_SIZE", 8)
+    requests = [
+        {
+            "init_dt": datetime(2025, 1, 1, tzinfo=timezone.utc),
+            "forecast_hour": forecast_hour,
+            "elements": [{"name": "APCP", "level": "surface"}],
+            "output_path": str(tmp_path / f"gfs_{forecast_hour:03d}.grib2"),
+        }
+        for forecast_hour in range(8)
+    ]
+
+    results = download_gfs_batch(requests, max_workers=8, quiet=True)
+
+    assert all(result.success for result in results)
+    assert s3_client.max_in_flight <= gfs.MAX_POOL_CONNECTIONS
+
+
+class FailingGribS3Client(FakeGribS3Client):
+    """下载 grib2 字节范围时失败，并记录下载期间输出文件是否存在的 S3 客户端"""
+
+    def __init__(self, output_path):
+        super().__init__()
+        self.output_path = output_path
+        self.output_exists = []
+
+    def get_object(self, Bucket, Key, Range=None):
+        self.output_exists.append(os.path.exists(self.output_path))
+        if Range is not None and Range.startswith("bytes=300-"):
+            raise IOError("Connection reset")
+        return super().get_object(Bucket, Key, Range)
+
+
+def test_download_gfs_data_failure_cleanup(test_output_dir, monkeypatch):
+    """测试下载失败时不留下不完整的文件"""
+    output_path = os.path.join(test_output_dir, "gfs_failure.grib2")
+    s3_client = FailingGribS3Client(output_path)
+    monkeypatch.setattr(gfs, "_get_s3_client", lambda region: s3_client)
+    monkeypatch.setattr(gfs, "USE_CRT", False)
+    monkeypatch.setattr(gfs, "SUBRANGE_THRESHOLD", 64)
+    monkeypatch.setattr(gfs, "SUBRANGE_SIZE", 64)
+
+    result = download_gfs_data(
+        datetime(2025, 1, 1, tzinfo=timezone.utc),
+        0,
+        [{"name": "UGRD", "level": "10 m above ground"}],
+        output_path,
+        quiet=True,
+    )
+
+    # 输出文件只在全部范围下载完成后才出现，临时文件被删除
+    assert not result.success
+    assert "Connection reset" in result.error_message
+    assert not any(s3_client.output_exists)
+    assert os.listdir(test_output_dir) == []
+
+
+class ShortBodyS3Client(FakeGribS3Client):
+    """返回的字节范围比请求的少一个字节的 S3 客户端"""
+
+    def get_object(self, Bucket, Key, Range=None):
+        response = super().get_object(Bucket, Key, Range)
+        if Range is not None and Range.startswith("bytes=164-"):
+            response["Body"] = io.BytesIO(response["Body"].read()[:-1])
+        return response
+
+
+def test_download_bytes_short_body(monkeypatch):
+    """测试子范围数据不完整时下载失败"""
+    monkeypatch.setattr(gfs, "SUBRANGE_THRESHOLD", 64)
+    monkeypatch.setattr(gfs, "SUBRANGE_SIZE", 64)
+
+    data = gfs.download_bytes(FakeGribS3Client(), "bucket", "key", 100, 300, quiet=True)
+    assert data == GRIB_CONTENT[100:300]
+
+    with pytest.raises(IOError, match="1 bytes missing"):
+        gfs.download_bytes(ShortBodyS3Client(), "bucket", "key", 100, 300, quiet=True)
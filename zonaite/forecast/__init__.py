@@ -1,4 +1,9 @@
-from .gfs import download_gfs_data
+from .gfs import download_gfs_batch, download_gfs_data, iter_gfs_data
 from .ifs import download_ifs_data
 
-__all__ = ["download_gfs_data", "download_ifs_data"]
+__all__ = [
+    "download_gfs_batch",
+    "download_gfs_data",
+    "download_ifs_data",
+    "iter_gfs_data",
+]
@@ -0,0 +1,59 @@
+"""Shared anonymous S3 client for the forecast downloaders
+
+The GFS and IFS downloaders read from public S3 buckets. They share one
+anonymous boto3 client per region, so consecutive downloads reuse the
+keep-alive connections of its pool instead of opening new ones.
+"""
+
+import threading
+from typing import Dict
+
+import boto3
+from botocore import UNSIGNED
+from botocore.config import Config
+
+# Size of the botocore HTTP connection pool, kept above the download concurrency
+MAX_POOL_CONNECTIONS = 32
+# Socket timeouts in seconds, a stalled connection is retried instead of hanging
+CONNECT_TIMEOUT = 3
+READ_TIMEOUT = 30
+
+# Anonymous S3 clients shared across downloads, keyed by region
+_CLIENT_CACHE: Dict[str, object] = {}
+_CLIENT_LOCK = threading.Lock()
+
+
+def _get_s3_client(region: str):
+    """Get the cached anonymous S3 client for a region
+
+    Clients are created lazily on first use and shared by all subsequent
+    downloads, so the service model loading and connection pool warm-up are
+    paid only once per process. botocore clients are thread-safe, so the
+    cached client can serve concurrent range requests.
+
+    Args:
+        region (str): AWS region of the bucket
+
+    Returns:
+        Boto3 S3 client with anonymous access
+    """
+    with _CLIENT_LOCK:
+        s3_client = _CLIENT_CACHE.get(region)
+        if s3_client is None:
+            # The connection pool is sized above the download concurrency so
+            # parallel range requests reuse keep-alive connections
+            s3_client = boto3.client(
+                "s3",
+                region_name=region,
+                config=Config(
+                    signature_version=UNSIGNED,
+                    s3={"addressing_style": "path"},
+                    max_pool_connections=MAX_POOL_CONNECTIONS,
+                    tcp_keepalive=True,
+                    connect_timeout=CONNECT_TIMEOUT,
+                    read_timeout=READ_TIMEOUT,
+                    retries={"mode": "standard", "max_attempts": 3},
+                ),
+            )
+            _CLIENT_CACHE[region] = s3_client
+        return s3_client
@@ -8,6 +8,10 @@ data elements.
 Key Features:
     - Selective download of specific variables and levels
     - Efficient byte-range requests for partial file downloads
+    - Concurrent range requests to hide network round-trip latency
+    - Local cache of idx files, which never change once published
+    - Optional AWS CRT S3 client for high-throughput downloads (pip install awscrt,
+      enabled with ZONAITE_USE_CRT=1)
     - Performance monitoring and logging
     - Object-oriented idx file parsing and querying
     - Type-safe data structures using dataclasses
@@ -34,19 +38,82 @@ Notes:
     - File naming format: gfs.YYYYMMDD/HH/atmos/gfs.tHHz.pgrb2.0p25.fHHH
     - Supported forecast cycles: 00, 06, 12, 18
     - Forecast hours range: 000-384
+    - idx files are cached in ~/.cache/zonaite/idx, set ZONAITE_IDX_CACHE_DIR to
+      use another directory
+    - The NOAA bucket only serves plain idx files. For a mirror bucket that also
+      stores gzip-compressed copies next to them (``<idx key>.gz``), add the
+      bucket name to COMPRESSED_IDX_BUCKETS to fetch the smaller copy; missing
+      ``.gz`` objects fall back to the plain idx file
 """
 
+import gzip
 import os
+import re
+import tempfile
 import time
+from bisect import bisect_right
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional, Tuple
-
-import boto3
-from botocore import UNSIGNED
-from botocore.config import Config
+from email.parser import BytesHeaderParser
+from functools import partial
+from numbers import Integral
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Set, Tuple, Union
+from urllib.parse import quote
+from uuid import uuid4
+
+import urllib3
+from botocore.exceptions import ClientError
 from loguru import logger
 
+from ._s3 import (
+    CONNECT_TIMEOUT,
+    MAX_POOL_CONNECTIONS,
+    READ_TIMEOUT,
+    _CLIENT_LOCK,
+    _get_s3_client,
+)
+
+try:
+    from awscrt.http import HttpHeaders, HttpRequest
+    from awscrt.s3 import S3Client, S3RequestType
+except ImportError:  # awscrt is an optional dependency
+    S3Client = None
+
+# Upper bound on concurrent range requests issued for a single download
+MAX_DOWNLOAD_WORKERS = 16
+# Byte ranges separated by at most this many bytes are fetched in one request
+MERGE_GAP_BYTES = 64 * 1024
+# Buffer size used when streaming response bodies to disk
+COPY_BUFSIZE = 1024 * 1024
+# Ranges larger than this are downloaded as concurrent sub-range requests
+SUBRANGE_THRESHOLD = 8 * 1024 * 1024
+SUBRANGE_SIZE = 8 * 1024 * 1024
+# Concurrent sub-range requests used by download_bytes for a single large range
+SUBRANGE_WORKERS = 8
+# Number of idx files prefetched ahead of the current request in batch downloads
+IDX_LOOKAHEAD = 2
+# Limits of the ranges fetched by one multi-range GET request
+MULTI_RANGE_MAX_RANGES = 32
+MULTI_RANGE_MAX_BYTES = 8 * 1024 * 1024
+# Local cache of downloaded idx files, overridden by ZONAITE_IDX_CACHE_DIR
+IDX_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "zonaite", "idx")
+# Maximum number of idx files kept in the cache
+IDX_CACHE_MAX_FILES = 1024
+# File name of cached idx files, only files matching it are ever evicted
+_IDX_CACHE_NAME = re.compile(r"\d{8}_\d{2}_\d{3}\.idx")
+# Buckets storing gzip-compressed idx files as "<idx key>.gz", none by default
+COMPRESSED_IDX_BUCKETS: Set[str] = set()
+# Download grib2 byte ranges with the AWS CRT S3 client, requires awscrt
+USE_CRT = os.environ.get("ZONAITE_USE_CRT", "").lower() in ("1", "true", "yes")
+# Expected network throughput in Gbps, the CRT client sizes its connections to it
+CRT_TARGET_THROUGHPUT_GBPS = 10.0
+
+# CRT clients and the multi-range HTTP pool shared across downloads
+_CRT_CLIENT_CACHE: Dict[str, object] = {}
+_HTTP_POOL = None
+
 
 @dataclass
 class GFSDownloadResult:
@@ -64,6 +131,9 @@ class GFSDownloadResult:
         download_time_s (Optional[float]): Total download time in seconds
         download_speed_mbs (Optional[float]): Average download speed in MB/s
         error_message (Optional[str]): Error message if download failed
+        element_offsets (Optional[Dict[Tuple[str, str], Tuple[int, int]]]): Mapping
+            of (variable, level) to the (offset, length) in bytes of the element in
+            the saved file. If several messages share a key, the first one is kept
     """
 
     success: bool
@@ -77,6 +147,7 @@ class GFSDownloadResult:
     download_time_s: Optional[float] = None
     download_speed_mbs: Optional[float] = None
     error_message: Optional[str] = None
+    element_offsets: Optional[Dict[Tuple[str, str], Tuple[int, int]]] = None
 
 
 @dataclass
@@ -107,56 +178,50 @@ class GribIdx:
         elements (List[GribElement]): List of all elements found in the idx file
     """
 
-    def __init__(self, idx_content: str):
+    def __init__(self, idx_content: Union[bytes, str]):
         """Initialize GribIdx with idx file content
 
         Args:
-            idx_content (str): Content of the idx file as string
+            idx_content (Union[bytes, str]): Content of the idx file, as raw bytes
+                or as string
         """
+        if isinstance(idx_content, str):
+            idx_content = idx_content.encode("utf-8")
         self.elements = self._parse_idx_content(idx_content)
 
-    def _parse_idx_content(self, idx_content: str) -> List[GribElement]:
+        # Index elements by (variable, level) for constant time lookups. A key
+        # may occur more than once (e.g. accumulations over different periods)
+        self._by_key: Dict[Tuple[str, str], List[GribElement]] = {}
+        for elem in self.elements:
+            self._by_key.setdefault((elem.variable, elem.level), []).append(elem)
+
+    def _parse_idx_content(self, idx_content: bytes) -> List[GribElement]:
         """Parse idx file content into GribElement objects
 
+        The content is parsed as bytes, only the variable and level fields of
+        each record are decoded to strings.
+
         Args:
-            idx_content (str): Content of the idx file
+            idx_content (bytes): Content of the idx file
 
         Returns:
             List[GribElement]: List of parsed elements
         """
-        elements = []
-        lines = idx_content.split("\n")
-
-        for i, line in enumerate(lines):
-            if not line.strip():
-                continue
-
-            parts = line.strip().split(":")
-            if len(parts) >= 6:
-                start_byte = int(parts[1])
-                variable = parts[3]
-                level = parts[4]
-
-                # Get end byte from next line
-                end_byte = None
-                if i < len(lines) - 1:
-                    next_line = lines[i + 1]
-                    if next_line.strip():
-                        next_parts = next_line.strip().split(":")
-                        if len(next_parts) >= 2:
-                            end_byte = int(next_parts[1])
-
-                if end_byte is not None:
-                    elements.append(
-                        GribElement(
-                            variable=variable,
-                            level=level,
-                            start_byte=start_byte,
-                            end_byte=end_byte,
-                        )
-                    )
-
-        return elements
+        # Only the first five fields are needed, so stop splitting after them
+        records = [
+            parts
+            for parts in (line.split(b":", 5) for line in idx_content.splitlines())
+            if len(parts) == 6
+        ]
+
+        # The end byte of a record is the start byte of the next one, so the
+        # last record has no known end and is skipped
+        return [
+            GribElement(
+                parts[3].decode(), parts[4].decode(), int(parts[1]), int(next_parts[1])
+            )
+            for parts, next_parts in zip(records, records[1:])
+        ]
 
     def find_elements(self, target_elements: List[Dict]) -> List[GribElement]:
         """Find specified elements in the idx file
@@ -179,10 +244,7 @@ class GribIdx:
         """
         result = []
         for target in target_elements:
-            for elem in self.elements:
-                if elem.variable == target["name"] and elem.level == target["level"]:
-                    logger.info(f"Found match: {elem.variable} @ {elem.level}")
-                    result.append(elem)
+            result.extend(self._by_key.get((target["name"], target["level"]), []))
         return result
 
     def get_byte_ranges(self, target_elements: List[Dict]) -> List[Tuple[int, int]]:
@@ -198,6 +260,215 @@ class GribIdx:
         return [(elem.start_byte, elem.end_byte) for elem in elements]
 
 
+def _merge_byte_ranges(
+    byte_ranges: List[Tuple[int, int]], max_gap: int = MERGE_GAP_BYTES
+) -> List[Tuple[int, int, List[int]]]:
+    """Coalesce byte ranges into spans that can be fetched with one request
+
+    Ranges are sorted by start byte and merged whenever the gap to the previous
+    span is at most ``max_gap`` bytes. Downloading a small gap is cheaper than
+    paying an extra request round-trip for it.
+
+    Args:
+        byte_ranges (List[Tuple[int, int]]): List of (start_byte, end_byte) tuples
+        max_gap (int, optional): Largest gap in bytes bridged when merging.
+            Defaults to MERGE_GAP_BYTES
+
+    Returns:
+        List[Tuple[int, int, List[int]]]: List of (start_byte, end_byte, members)
+            tuples, where members are the indices in ``byte_ranges`` of the
+            ranges covered by the span
+    """
+    spans = []
+    order = sorted(range(len(byte_ranges)), key=lambda i: byte_ranges[i][0])
+
+    for i in order:
+        start_byte, end_byte = byte_ranges[i]
+        if spans and start_byte - spans[-1][1] <= max_gap:
+            span_start, span_end, members = spans[-1]
+            members.append(i)
+            spans[-1] = (span_start, max(span_end, end_byte), members)
+        else:
+            spans.append((start_byte, end_byte, [i]))
+
+    return spans
+
+
+def _split_span(
+    start_byte: int, end_byte: int, parts: List[Tuple[int, int, int]]
+) -> List[Tuple[int, int, List[Tuple[int, int, int]]]]:
+    """Split a large span into sub-ranges that can be downloaded concurrently
+
+    Spans up to SUBRANGE_THRESHOLD bytes are returned unchanged, larger ones are
+    cut into sub-ranges of SUBRANGE_SIZE bytes. Parts are clipped to the
+    sub-ranges they overlap, with their output offsets shifted accordingly, and
+    every sub-range is trimmed to its parts. Its response body is then read to
+    the end, so the connection goes back to the pool instead of being closed.
+
+    Args:
+        start_byte (int): Starting byte position of the span (inclusive)
+        end_byte (int): Ending byte position of the span (exclusive)
+        parts (List[Tuple[int, int, int]]): (start_byte, end_byte, output_offset)
+            tuples inside the span, sorted by start_byte
+
+    Returns:
+        List[Tuple[int, int, List[Tuple[int, int, int]]]]: List of (start_byte,
+            end_byte, parts) tuples, one per request to issue
+    """
+    if end_byte - start_byte <= SUBRANGE_THRESHOLD:
+        return [(start_byte, end_byte, parts)]
+
+    subranges = []
+    for sub_start in range(start_byte, end_byte, SUBRANGE_SIZE):
+        sub_end = min(sub_start + SUBRANGE_SIZE, end_byte)
+        sub_parts = [
+            (
+                max(part_start, sub_start),
+                min(part_end, sub_end),
+                output_offset + max(part_start, sub_start) - part_start,
+            )
+            for part_start, part_end, output_offset in parts
+            if part_start < sub_end and part_end > sub_start
+        ]
+        # Skip sub-ranges that only cover a gap between parts
+        if sub_parts:
+            first = min(part_start for part_start, _, _ in sub_parts)
+            last = max(part_end for _, part_end, _ in sub_parts)
+            subranges.append((first, last, sub_parts))
+    return subranges
+
+
+def _to_utc(init_dt: datetime) -> datetime:
+    """Convert a datetime to UTC, treating naive datetimes as UTC
+
+    Args:
+        init_dt (datetime): Datetime object to convert
+
+    Returns:
+        datetime: Timezone-aware datetime in UTC
+    """
+    # Ensure datetime has timezone information
+    if init_dt.tzinfo is None:
+        return init_dt.replace(tzinfo=timezone.utc)
+    # Convert to UTC for consistency
+    return init_dt.astimezone(timezone.utc)
+
+
+def _validate_request(init_dt: datetime, forecast_hour: int) -> Optional[str]:
+    """Check that a GFS file can exist for the initialization time and forecast hour
+
+    GFS runs four cycles a day (00, 06, 12 and 18 UTC) and publishes hourly
+    forecasts up to 120 hours, then 3-hourly forecasts up to 384 hours.
+
+    Args:
+        init_dt (datetime): Initialization time in UTC
+        forecast_hour (int): Forecast hour (0-384)
+
+    Returns:
+        Optional[str]: Error message if the request is invalid, otherwise None
+    """
+    if isinstance(forecast_hour, bool) or not isinstance(forecast_hour, Integral):
+        return f"Invalid forecast hour: {forecast_hour!r}, expected an integer"
+    if not 0 <= forecast_hour <= 384:
+        return f"Invalid forecast hour: {forecast_hour}, expected 0-384"
+    if forecast_hour > 120 and forecast_hour % 3 != 0:
+        return f"Invalid forecast hour: {forecast_hour}, expected a multiple of 3 after 120"
+    if init_dt.hour not in (0, 6, 12, 18):
+        return f"Invalid cycle: {init_dt:%H}, expected one of 00, 06, 12, 18"
+    if init_dt > datetime.now(timezone.utc):
+        return f"Initialization time is in the future: {init_dt}"
+    return None
+
+
+def _build_grib_key(init_dt: datetime, forecast_hour: int) -> str:
+    """Build the S3 key of a GFS grib2 file
+
+    Args:
+        init_dt (datetime): Initialization time in UTC
+        forecast_hour (int): Forecast hour (0-384)
+
+    Returns:
+        str: S3 object key of the grib2 file, the idx file key adds ".idx"
+    """
+    date_str = init_dt.strftime("%Y%m%d")
+    cycle_str = init_dt.strftime("%H")
+    return f"gfs.{date_str}/{cycle_str}/atmos/gfs.t{cycle_str}z.pgrb2.0p25.f{forecast_hour:03d}"
+
+
+def _get_crt_client(region: str):
+    """Get the cached anonymous AWS CRT S3 client for a region
+
+    The CRT client splits ranged GETs into parts and downloads them over
+    several connections paced to CRT_TARGET_THROUGHPUT_GBPS. Without a signing
+    config it sends unsigned requests, like the anonymous boto3 client.
+
+    Args:
+        region (str): AWS region of the bucket
+
+    Returns:
+        awscrt.s3.S3Client: CRT S3 client with anonymous access
+
+    Raises:
+        ImportError: If awscrt is not installed
+    """
+    if S3Client is None:
+        raise ImportError("USE_CRT requires awscrt, install it with zonaite[crt]")
+
+    with _CLIENT_LOCK:
+        crt_client = _CRT_CLIENT_CACHE.get(region)
+        if crt_client is None:
+            crt_client = S3Client(
+                region=region, throughput_target_gbps=CRT_TARGET_THROUGHPUT_GBPS
+            )
+            _CRT_CLIENT_CACHE[region] = crt_client
+        return crt_client
+
+
+def _get_range(
+    s3_client, bucket: str, key: str, start_byte: int, end_byte: int
+) -> bytes:
+    """Download a byte range from S3 with a single GET request
+
+    Args:
+        s3_client: Boto3 S3 client instance
+        bucket (str): S3 bucket name
+        key (str): S3 object key (path to the file in the bucket)
+        start_byte (int): Starting byte position (inclusive)
+        end_byte (int): Ending byte position (exclusive)
+
+    Returns:
+        bytes: The downloaded data within the specified byte range
+    """
+    response = s3_client.get_object(
+        Bucket=bucket, Key=key, Range=f"bytes={start_byte}-{end_byte - 1}"
+    )
+    return response["Body"].read()
+
+
+def _log_transfer(
+    size: int, start_time: float, quiet: bool, ranges: Optional[int] = None
+) -> None:
+    """Log the size, time and speed of a completed download
+
+    Args:
+        size (int): Number of bytes downloaded
+        start_time (float): Start time of the download, as returned by time.time()
+        quiet (bool): If True, nothing is logged
+        ranges (Optional[int], optional): Number of ranges fetched with one
+            request, included in the message if given. Defaults to None
+    """
+    if quiet:
+        return
+
+    duration = time.time() - start_time
+    speed_mbps = (size / 1024 / 1024) / duration if duration > 0 else 0
+    prefix = f"{ranges} ranges, " if ranges is not None else ""
+    # Attribute the record to the download function instead of this helper
+    logger.opt(depth=1).info(
+        f"Download completed: {prefix}{size / 1024 / 1024:.2f}MB, Time: {duration:.2f}s, Speed: {speed_mbps:.2f}MB/s"
+    )
+
+
 def download_bytes(
     s3_client,
     bucket: str,
@@ -205,7 +476,7 @@ def download_bytes(
     start_byte: int,
     end_byte: int,
     quiet: bool = False,
-) -> bytes:
+) -> Union[bytes, bytearray]:
     """Download data for specified byte range from S3
 
     This function downloads a specific byte range from an S3 object and logs the
@@ -220,7 +491,9 @@ def download_bytes(
         quiet (bool, optional): If True, suppress all log output. Defaults to False
 
     Returns:
-        bytes: The downloaded data within the specified byte range
+        Union[bytes, bytearray]: The downloaded data within the specified byte
+            range. Ranges larger than SUBRANGE_THRESHOLD are returned as a
+            bytearray to avoid copying them once more
 
     Raises:
         botocore.exceptions.ClientError: If there's an error accessing the S3 object
@@ -229,21 +502,546 @@ def download_bytes(
     chunk_size = end_byte - start_byte
     start_time = time.time()
 
+    if chunk_size > SUBRANGE_THRESHOLD:
+        # Fetch large ranges as concurrent sub-ranges, one TCP stream alone
+        # cannot saturate the available bandwidth. Every sub-range is copied
+        # into its own slot of a buffer allocated once at the final size.
+        data = bytearray(chunk_size)
+
+        def fill(s: int, e: int) -> None:
+            chunk = _get_range(s3_client, bucket, key, s, e)
+            # A short body would resize the buffer and shift the other slots
+            if len(chunk) != e - s:
+                raise IOError(
+                    f"Unexpected end of stream, {e - s - len(chunk)} bytes missing"
+                )
+            lo, hi = s - start_byte, e - start_byte
+            data[lo:hi] = chunk
+
+        with ThreadPoolExecutor(max_workers=SUBRANGE_WORKERS) as executor:
+            futures = [
+                executor.submit(fill, s, min(s + SUBRANGE_SIZE, end_byte))
+                for s in range(start_byte, end_byte, SUBRANGE_SIZE)
+            ]
+            for future in futures:
+                future.result()
+    else:
+        data = _get_range(s3_client, bucket, key, start_byte, end_byte)
+
+    _log_transfer(chunk_size, start_time, quiet)
+
+    return data
+
+
+def _idx_cache_path(bucket: str, init_dt: datetime, forecast_hour: int) -> Path:
+    """Get the local cache path of an idx file
+
+    The cache directory defaults to ~/.cache/zonaite/idx and can be changed
+    with the ZONAITE_IDX_CACHE_DIR environment variable.
+
+    Args:
+        bucket (str): S3 bucket name
+        init_dt (datetime): Initialization time in UTC
+        forecast_hour (int): Forecast hour (0-384)
+
+    Returns:
+        Path: Path of the cached idx file
+    """
+    cache_dir = Path(os.environ.get("ZONAITE_IDX_CACHE_DIR") or IDX_CACHE_DIR)
+    file_name = f"{init_dt.strftime('%Y%m%d_%H')}_{forecast_hour:03d}.idx"
+    return cache_dir / bucket / file_name
+
+
+def _evict_idx_cache(cache_dir: Path) -> None:
+    """Remove the least recently used idx files beyond IDX_CACHE_MAX_FILES
+
+    The cache directory may be shared with other data, e.g. a GRIB archive
+    keeping its own idx files, so only files named like the cache entries
+    written by _idx_cache_path are considered.
+
+    Args:
+        cache_dir (Path): Root directory of the idx cache
+    """
+    entries = []
+    for path in cache_dir.glob("*/*.idx"):
+        if not _IDX_CACHE_NAME.fullmatch(path.name):
+            continue
+        try:
+            entries.append((path.stat().st_mtime, path))
+        except FileNotFoundError:
+            pass
+
+    entries.sort()
+    for _, path in entries[: max(0, len(entries) - IDX_CACHE_MAX_FILES)]:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def download_idx(
+    s3_client, bucket: str, key: str, cache_path: Optional[Path] = None
+) -> bytes:
+    """Download an idx file from S3, or read it from the local cache
+
+    Published idx files never change, so once downloaded they are kept in the
+    local cache and later calls skip the request entirely. The cache keeps at
+    most IDX_CACHE_MAX_FILES files and evicts the least recently used ones.
+
+    Args:
+        s3_client: Boto3 S3 client instance
+        bucket (str): S3 bucket name
+        key (str): S3 object key of the idx file
+        cache_path (Optional[Path], optional): Local cache path of the idx file.
+            Defaults to None, which disables the cache
+
+    Returns:
+        bytes: Raw content of the idx file
+
+    Raises:
+        botocore.exceptions.ClientError: If there's an error accessing the S3 object
+    """
+    if cache_path is not None:
+        try:
+            idx_content = cache_path.read_bytes()
+        except OSError:
+            # Missing or unreadable cache entries are downloaded again
+            idx_content = None
+        if idx_content is not None:
+            try:
+                # Refresh the modification time, it orders the cache eviction
+                os.utime(cache_path)
+            except OSError:
+                # The cache may be shared and read-only
+                pass
+            return idx_content
+
+    idx_content = _get_idx_object(s3_client, bucket, key)
+
+    if cache_path is not None:
+        # Write to a temporary file first so readers never see a partial idx
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(idx_content)
+            os.replace(tmp_path, cache_path)
+            _evict_idx_cache(cache_path.parent.parent)
+        except OSError as e:
+            logger.debug(f"Failed to cache idx file {key}: {e}")
+
+    return idx_content
+
+
+def _get_idx_object(s3_client, bucket: str, key: str) -> bytes:
+    """Get the raw content of an idx file from S3
+
+    For buckets listed in COMPRESSED_IDX_BUCKETS the gzip-compressed copy
+    ``<key>.gz`` is requested first, which is several times smaller than the
+    plain text. If it does not exist the plain idx file is requested instead.
+    Anonymous requests for a missing key are answered with 403 AccessDenied by
+    buckets that do not allow public listing, so that counts as missing too.
+
+    Args:
+        s3_client: Boto3 S3 client instance
+        bucket (str): S3 bucket name
+        key (str): S3 object key of the idx file
+
+    Returns:
+        bytes: Uncompressed content of the idx file
+
+    Raises:
+        botocore.exceptions.ClientError: If there's an error accessing the S3 object
+    """
+    if bucket in COMPRESSED_IDX_BUCKETS:
+        try:
+            response = s3_client.get_object(Bucket=bucket, Key=f"{key}.gz")
+            return gzip.decompress(response["Body"].read())
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code")
+            if error_code not in ("403", "404", "AccessDenied", "NoSuchKey"):
+                raise
+
+    response = s3_client.get_object(Bucket=bucket, Key=key)
+    return response["Body"].read()
+
+
+def _copy_bytes(src, dst: Optional[BinaryIO], size: int) -> None:
+    """Copy exactly ``size`` bytes from a stream, discarding them if ``dst`` is None
+
+    Args:
+        src: Readable binary stream (e.g. botocore StreamingBody)
+        dst (Optional[BinaryIO]): Writable binary file, or None to skip the bytes
+        size (int): Number of bytes to copy
+
+    Raises:
+        IOError: If the stream ends before ``size`` bytes were read
+    """
+    while size > 0:
+        buf = src.read(min(COPY_BUFSIZE, size))
+        if not buf:
+            raise IOError(f"Unexpected end of stream, {size} bytes missing")
+        if dst is not None:
+            dst.write(buf)
+        size -= len(buf)
+
+
+def download_span_to_file(
+    s3_client,
+    bucket: str,
+    key: str,
+    start_byte: int,
+    end_byte: int,
+    parts: List[Tuple[int, int, int]],
+    output_path: str,
+    quiet: bool = False,
+) -> int:
+    """Download a byte range from S3 and stream selected parts of it to a file
+
+    The response body is consumed in chunks of COPY_BUFSIZE bytes and written
+    straight to the output file, so memory usage does not grow with the size
+    of the range. Each part is written at its own offset in the output file,
+    which allows several spans to be downloaded into the same file concurrently.
+
+    Args:
+        s3_client: Boto3 S3 client instance
+        bucket (str): S3 bucket name
+        key (str): S3 object key (path to the file in the bucket)
+        start_byte (int): Starting byte position of the span (inclusive)
+        end_byte (int): Ending byte position of the span (exclusive)
+        parts (List[Tuple[int, int, int]]): Non-overlapping (start_byte, end_byte,
+            output_offset) tuples inside the span, sorted by start_byte
+        output_path (str): Path of the existing output file to write into
+        quiet (bool, optional): If True, suppress all log output. Defaults to False
+
+    Returns:
+        int: Number of bytes written to the output file
+
+    Raises:
+        botocore.exceptions.ClientError: If there's an error accessing the S3 object
+        IOError: If the response body is shorter than the requested range
+    """
+    chunk_size = end_byte - start_byte
+    start_time = time.time()
+    written = 0
+
     response = s3_client.get_object(
         Bucket=bucket, Key=key, Range=f"bytes={start_byte}-{end_byte - 1}"
     )
-    data = response["Body"].read()
+    body = response["Body"]
 
-    end_time = time.time()
-    duration = end_time - start_time
-    speed_mbps = (chunk_size / 1024 / 1024) / duration if duration > 0 else 0
+    try:
+        with open(output_path, "r+b") as f:
+            position = start_byte
+            for part_start, part_end, output_offset in parts:
+                # Skip the gap between two parts of the span
+                _copy_bytes(body, None, part_start - position)
+                f.seek(output_offset)
+                _copy_bytes(body, f, part_end - part_start)
+                written += part_end - part_start
+                position = part_end
+    finally:
+        body.close()
 
-    if not quiet:
-        logger.info(
-            f"Download completed: {chunk_size / 1024 / 1024:.2f}MB, Time: {duration:.2f}s, Speed: {speed_mbps:.2f}MB/s"
+    _log_transfer(chunk_size, start_time, quiet)
+
+    return written
+
+
+def _place_chunk(
+    chunk: bytes, offset: int, parts: List[Tuple[int, int, int]]
+) -> List[Tuple[int, bytes]]:
+    """Map a body chunk received at an object offset onto the parts it covers
+
+    Chunks may arrive in any order and may straddle several parts, the bytes
+    falling into gaps between parts are dropped.
+
+    Args:
+        chunk (bytes): Body chunk
+        offset (int): Position of the chunk in the object
+        parts (List[Tuple[int, int, int]]): (start_byte, end_byte, output_offset)
+            tuples as in download_span_to_file
+
+    Returns:
+        List[Tuple[int, bytes]]: (output_offset, data) tuples to write
+    """
+    chunk_start, chunk_end = offset, offset + len(chunk)
+    writes = []
+    for part_start, part_end, output_offset in parts:
+        lo, hi = max(part_start, chunk_start), min(part_end, chunk_end)
+        if lo < hi:
+            begin, stop = lo - chunk_start, hi - chunk_start
+            writes.append((output_offset + lo - part_start, chunk[begin:stop]))
+    return writes
+
+
+def download_span_to_file_crt(
+    crt_client,
+    bucket: str,
+    region: str,
+    key: str,
+    start_byte: int,
+    end_byte: int,
+    parts: List[Tuple[int, int, int]],
+    output_path: str,
+    quiet: bool = False,
+) -> int:
+    """Download a byte range with the AWS CRT S3 client and write parts of it to a file
+
+    Same as download_span_to_file, but the request goes through the CRT client,
+    which fetches large ranges as concurrent parts on its own.
+
+    Args:
+        crt_client: awscrt.s3.S3Client instance
+        bucket (str): S3 bucket name
+        region (str): AWS region of the bucket
+        key (str): S3 object key (path to the file in the bucket)
+        start_byte (int): Starting byte position of the span (inclusive)
+        end_byte (int): Ending byte position of the span (exclusive)
+        parts (List[Tuple[int, int, int]]): Non-overlapping (start_byte, end_byte,
+            output_offset) tuples inside the span, sorted by start_byte
+        output_path (str): Path of the existing output file to write into
+        quiet (bool, optional): If True, suppress all log output. Defaults to False
+
+    Returns:
+        int: Number of bytes written to the output file
+
+    Raises:
+        awscrt.s3.S3ResponseError: If there's an error accessing the S3 object
+    """
+    chunk_size = end_byte - start_byte
+    start_time = time.time()
+    received = 0
+
+    headers = HttpHeaders(
+        [
+            ("Host", f"s3.{region}.amazonaws.com"),
+            ("Range", f"bytes={start_byte}-{end_byte - 1}"),
+        ]
+    )
+    request = HttpRequest("GET", f"/{bucket}/{quote(key)}", headers)
+
+    with open(output_path, "r+b") as f:
+
+        def on_body(chunk, offset, **kwargs):
+            # offset is the position of the chunk in the object, the CRT client
+            # invokes this callback for one chunk at a time
+            nonlocal received
+            for output_offset, data in _place_chunk(chunk, offset, parts):
+                f.seek(output_offset)
+                f.write(data)
+            received += len(chunk)
+
+        s3_request = crt_client.make_request(
+            type=S3RequestType.GET_OBJECT, request=request, on_body=on_body
         )
+        s3_request.finished_future.result()
 
-    return data
+    if received != chunk_size:
+        raise IOError(
+            f"Unexpected end of stream, {chunk_size - received} bytes missing"
+        )
+
+    _log_transfer(chunk_size, start_time, quiet)
+
+    return sum(part_end - part_start for part_start, part_end, _ in parts)
+
+
+def _group_range_requests(
+    range_requests: List[Tuple[int, int, List[Tuple[int, int, int]]]],
+) -> List[List[Tuple[int, int, List[Tuple[int, int, int]]]]]:
+    """Group consecutive range requests for multi-range GET requests
+
+    A group holds at most MULTI_RANGE_MAX_RANGES ranges and, unless it is a
+    single range, at most MULTI_RANGE_MAX_BYTES bytes, since a multipart
+    response is read into memory before being written out.
+
+    Args:
+        range_requests (List[Tuple[int, int, List[Tuple[int, int, int]]]]): List
+            of (start_byte, end_byte, parts) tuples sorted by start_byte
+
+    Returns:
+        List[List[Tuple[int, int, List[Tuple[int, int, int]]]]]: Groups of range
+            requests, each fetched with one request
+    """
+    groups = []
+    group_bytes = 0
+    for range_request in range_requests:
+        size = range_request[1] - range_request[0]
+        has_room = groups and len(groups[-1]) < MULTI_RANGE_MAX_RANGES
+        if has_room and group_bytes + size <= MULTI_RANGE_MAX_BYTES:
+            groups[-1].append(range_request)
+            group_bytes += size
+        else:
+            groups.append([range_request])
+            group_bytes = size
+    return groups
+
+
+def _get_http_pool():
+    """Get the shared urllib3 pool used for multi-range GET requests
+
+    Returns:
+        urllib3.PoolManager: HTTP connection pool manager
+    """
+    global _HTTP_POOL
+    with _CLIENT_LOCK:
+        if _HTTP_POOL is None:
+            _HTTP_POOL = urllib3.PoolManager(
+                maxsize=MAX_POOL_CONNECTIONS,
+                timeout=urllib3.Timeout(connect=CONNECT_TIMEOUT, read=READ_TIMEOUT),
+            )
+        return _HTTP_POOL
+
+
+def download_multi_range_to_file(
+    s3_client,
+    bucket: str,
+    key: str,
+    range_requests: List[Tuple[int, int, List[Tuple[int, int, int]]]],
+    output_path: str,
+    quiet: bool = False,
+) -> Optional[int]:
+    """Download several byte ranges with one multi-range GET request
+
+    All ranges are sent in a single ``Range`` header and the parts of the
+    ``multipart/byteranges`` response are mapped back to their ranges by their
+    ``Content-Range`` header. Amazon S3 itself ignores multi-range requests and
+    answers with the whole object; such responses are closed without reading
+    the body and None is returned, so the caller can fall back to one request
+    per range.
+
+    Args:
+        s3_client: Boto3 S3 client instance, used to build the object URL
+        bucket (str): S3 bucket name
+        key (str): S3 object key (path to the file in the bucket)
+        range_requests (List[Tuple[int, int, List[Tuple[int, int, int]]]]): List
+            of (start_byte, end_byte, parts) tuples, where parts are
+            (start_byte, end_byte, output_offset) tuples as in
+            download_span_to_file
+        output_path (str): Path of the existing output file to write into
+        quiet (bool, optional): If True, suppress all log output. Defaults to False
+
+    Returns:
+        Optional[int]: Number of bytes written to the output file, or None if the
+            server does not support multi-range requests and nothing was written
+
+    Raises:
+        IOError: If the multipart response is malformed
+    """
+    chunk_size = sum(
+        end_byte - start_byte for start_byte, end_byte, _ in range_requests
+    )
+    start_time = time.time()
+
+    url = s3_client.generate_presigned_url(
+        "get_object", Params={"Bucket": bucket, "Key": key}
+    )
+    range_header = "bytes=" + ",".join(
+        f"{start_byte}-{end_byte - 1}" for start_byte, end_byte, _ in range_requests
+    )
+    response = _get_http_pool().request(
+        "GET", url, headers={"Range": range_header}, preload_content=False
+    )
+
+    content_type = response.headers.get("Content-Type", "")
+    if response.status != 206 or not content_type.startswith("multipart/byteranges"):
+        # Do not download a full object we did not ask for
+        response.close()
+        response.release_conn()
+        return None
+
+    try:
+        body = response.read()
+    finally:
+        response.release_conn()
+
+    # Read every part by the length given in its Content-Range header, so
+    # part data that happens to contain the boundary is not split
+    boundary_match = re.search(r'boundary="?([^";]+)"?', content_type)
+    if boundary_match is None:
+        raise IOError("Malformed multipart/byteranges response: missing boundary")
+    boundary = b"--" + boundary_match.group(1).encode()
+
+    received = {}
+    position = body.find(boundary)
+    while position != -1:
+        header_start = position + len(boundary)
+        # The closing delimiter ends with "--"
+        if body.startswith(b"--", header_start):
+            break
+        header_end = body.find(b"\r\n\r\n", header_start)
+        if header_end == -1:
+            raise IOError("Malformed multipart/byteranges response: truncated part")
+        headers = BytesHeaderParser().parsebytes(body[header_start:header_end].lstrip())
+        range_match = re.match(r"bytes (\d+)-(\d+)/", headers.get("Content-Range", ""))
+        if range_match is None:
+            raise IOError("Malformed multipart/byteranges response: no Content-Range")
+        first, last = int(range_match.group(1)), int(range_match.group(2))
+        data_start = header_end + 4
+        data_end = data_start + last - first + 1
+        part = body[data_start:data_end]
+        if len(part) != last - first + 1:
+            raise IOError("Malformed multipart/byteranges response: truncated part")
+        received[(first, last + 1)] = part
+        position = body.find(boundary, data_end)
+
+    if any(
+        (start_byte, end_byte) not in received
+        for start_byte, end_byte, _ in range_requests
+    ):
+        # The server merged or dropped ranges, fall back to single requests
+        return None
+
+    written = 0
+    with open(output_path, "r+b") as f:
+        for start_byte, end_byte, parts in range_requests:
+            data = received[(start_byte, end_byte)]
+            for part_start, part_end, output_offset in parts:
+                lo, hi = part_start - start_byte, part_end - start_byte
+                f.seek(output_offset)
+                f.write(data[lo:hi])
+                written += part_end - part_start
+
+    _log_transfer(chunk_size, start_time, quiet, ranges=len(range_requests))
+
+    return written
+
+
+def _download_range_group(
+    download_range,
+    s3_client,
+    bucket: str,
+    key: str,
+    group: List[Tuple[int, int, List[Tuple[int, int, int]]]],
+    output_path: str,
+    quiet: bool = False,
+) -> None:
+    """Download a group of range requests into the output file
+
+    Groups of several ranges are first tried as one multi-range GET request,
+    single ranges and unsupported multi-range requests use one request per range.
+
+    Args:
+        download_range: download_span_to_file or download_span_to_file_crt with
+            the client and bucket arguments bound
+        s3_client: Boto3 S3 client instance
+        bucket (str): S3 bucket name
+        key (str): S3 object key (path to the file in the bucket)
+        group (List[Tuple[int, int, List[Tuple[int, int, int]]]]): List of
+            (start_byte, end_byte, parts) tuples
+        output_path (str): Path of the existing output file to write into
+        quiet (bool, optional): If True, suppress all log output. Defaults to False
+    """
+    if len(group) > 1:
+        written = download_multi_range_to_file(
+            s3_client, bucket, key, group, output_path, quiet=quiet
+        )
+        if written is not None:
+            return
+
+    for range_start, range_end, parts in group:
+        download_range(key, range_start, range_end, parts, output_path, quiet=quiet)
 
 
 def download_gfs_data(
@@ -254,6 +1052,9 @@ def download_gfs_data(
     bucket: str = "noaa-gfs-bdp-pds",
     region: str = "us-east-1",
     quiet: bool = False,
+    verbose: bool = False,
+    use_idx_cache: bool = True,
+    multi_range: bool = False,
 ) -> GFSDownloadResult:
     """Download GFS data for specified time and elements
 
@@ -273,6 +1074,56 @@ def download_gfs_data(
         bucket (str, optional): S3 bucket name. Defaults to 'noaa-gfs-bdp-pds'
         region (str, optional): AWS region. Defaults to 'us-east-1'
         quiet (bool, optional): If True, suppress all log output. Defaults to False
+        verbose (bool, optional): If True, also log every byte range request.
+            Defaults to False
+        use_idx_cache (bool, optional): If True, reuse idx files cached on local
+            disk and cache newly downloaded ones. Defaults to True
+        multi_range (bool, optional): If True, fetch several small byte ranges
+            with one multi-range GET request. Amazon S3 does not support this,
+            so only enable it for mirrors that do; otherwise every group costs
+            an extra request before falling back. Defaults to False
+
+    Returns:
+        GFSDownloadResult: Download result containing success status and metadata
+    """
+    return _download_gfs_data(
+        init_dt,
+        forecast_hour,
+        elements,
+        output_path,
+        bucket=bucket,
+        region=region,
+        quiet=quiet,
+        verbose=verbose,
+        use_idx_cache=use_idx_cache,
+        multi_range=multi_range,
+    )
+
+
+def _download_gfs_data(
+    init_dt: datetime,
+    forecast_hour: int,
+    elements: List[Dict],
+    output_path: str,
+    bucket: str = "noaa-gfs-bdp-pds",
+    region: str = "us-east-1",
+    quiet: bool = False,
+    verbose: bool = False,
+    use_idx_cache: bool = True,
+    multi_range: bool = False,
+    idx_future: Optional[Future] = None,
+    max_range_workers: int = MAX_DOWNLOAD_WORKERS,
+) -> GFSDownloadResult:
+    """Download GFS data, optionally with an idx file that is already being fetched
+
+    Implements download_gfs_data, see there for the other arguments.
+
+    Args:
+        idx_future (Optional[Future], optional): Pending download of the idx file
+            content, used by download_gfs_batch to prefetch idx files. Defaults
+            to None, in which case the idx file is downloaded here
+        max_range_workers (int, optional): Upper bound on concurrent range
+            requests. Defaults to MAX_DOWNLOAD_WORKERS
 
     Returns:
         GFSDownloadResult: Download result containing success status and metadata
@@ -280,12 +1131,7 @@ def download_gfs_data(
     total_start_time = time.time()
     total_bytes = 0
 
-    # Ensure datetime has timezone information
-    if init_dt.tzinfo is None:
-        init_dt = init_dt.replace(tzinfo=timezone.utc)
-    else:
-        # Convert to UTC for consistency
-        init_dt = init_dt.astimezone(timezone.utc)
+    init_dt = _to_utc(init_dt)
 
     # Extract date and cycle from datetime
     date_str = init_dt.strftime("%Y%m%d")
@@ -300,27 +1146,40 @@ def download_gfs_data(
         file_path=output_path,
     )
 
+    # Reject requests that cannot exist before making any network request
+    error_message = _validate_request(init_dt, forecast_hour)
+    if error_message is not None:
+        result.error_message = error_message
+        if not quiet:
+            logger.warning(result.error_message)
+        return result
+
     try:
         # Build file path
-        grib_key = f"gfs.{date_str}/{cycle_str}/atmos/gfs.t{cycle_str}z.pgrb2.0p25.f{forecast_hour:03d}"
+        grib_key = _build_grib_key(init_dt, forecast_hour)
         idx_key = f"{grib_key}.idx"
 
-        # Create S3 client with anonymous access
-        s3_client = boto3.client(
-            "s3",
-            region_name=region,
-            config=Config(signature_version=UNSIGNED, s3={"addressing_style": "path"}),
-        )
+        # Reuse the process-wide anonymous S3 client for this region
+        s3_client = _get_s3_client(region)
 
-        # Download and parse idx file
-        if not quiet:
-            logger.info(f"Downloading idx file: {idx_key}")
-        response = s3_client.get_object(Bucket=bucket, Key=idx_key)
-        idx_content = response["Body"].read().decode("utf-8")
+        # Download and parse idx file, unless it is already being prefetched
+        if idx_future is None:
+            if not quiet:
+                logger.info(f"Downloading idx file: {idx_key}")
+            cache_path = (
+                _idx_cache_path(bucket, init_dt, forecast_hour)
+                if use_idx_cache
+                else None
+            )
+            idx_content = download_idx(s3_client, bucket, idx_key, cache_path)
+        else:
+            idx_content = idx_future.result()
 
         # Parse idx file and find elements
         grib_idx = GribIdx(idx_content)
         selected_elements = grib_idx.find_elements(elements)
+        if not quiet:
+            logger.info(f"Matched {len(selected_elements)}/{len(elements)} elements")
 
         if not selected_elements:
             result.error_message = f"Specified elements not found: {elements}"
@@ -328,46 +1187,105 @@ def download_gfs_data(
                 logger.warning(result.error_message)
             return result
 
-        # Get the byte ranges for all elements
-        byte_ranges = grib_idx.get_byte_ranges(elements)
-
-        # Sort byte ranges to ensure we download in order
-        byte_ranges.sort(key=lambda x: x[0])
-
-        # Merge overlapping ranges
-        merged_ranges = []
-        current_start, current_end = byte_ranges[0]
-
-        for start, end in byte_ranges[1:]:
-            if start <= current_end:
-                current_end = max(current_end, end)
+        # Drop duplicate matches so each GRIB message is written only once
+        unique_elements = list(
+            {
+                (elem.start_byte, elem.end_byte): elem for elem in selected_elements
+            }.values()
+        )
+        byte_ranges = [(elem.start_byte, elem.end_byte) for elem in unique_elements]
+
+        # Coalesce adjacent or nearby ranges so each span needs one request
+        spans = _merge_byte_ranges(byte_ranges)
+
+        # Lay the elements out back to back in the requested order
+        output_offsets = []
+        element_offsets = {}
+        total_bytes = 0
+        for elem in unique_elements:
+            length = elem.end_byte - elem.start_byte
+            output_offsets.append(total_bytes)
+            element_offsets.setdefault(
+                (elem.variable, elem.level), (total_bytes, length)
+            )
+            total_bytes += length
+
+        # Large spans are fetched as several concurrent sub-range requests,
+        # the CRT client splits them into parts by itself
+        range_requests = []
+        for span_start, span_end, members in spans:
+            parts = [(*byte_ranges[i], output_offsets[i]) for i in members]
+            if USE_CRT:
+                range_requests.append((span_start, span_end, parts))
             else:
-                merged_ranges.append((current_start, current_end))
-                current_start, current_end = start, end
-        merged_ranges.append((current_start, current_end))
+                range_requests.extend(_split_span(span_start, span_end, parts))
 
-        # Download and merge data
+        if USE_CRT:
+            download_range = partial(
+                download_span_to_file_crt, _get_crt_client(region), bucket, region
+            )
+        else:
+            download_range = partial(download_span_to_file, s3_client, bucket)
+
+        # Create the output directory up front, range downloads write directly
+        # into a temporary file next to the output file
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+        # Allocate the file at its final size, the downloads fill disjoint slots.
+        # It only replaces output_path once complete, so an interrupted download
+        # never leaves a full-size file with unfilled holes behind.
+        part_path = f"{output_path}.{uuid4().hex}.part"
+        with open(part_path, "xb") as f:
+            f.truncate(total_bytes)
+
+        # Download and save data
         if not quiet:
             logger.info(f"Starting data download: {grib_key}")
-        merged_data = bytearray()
-
-        for start_byte, end_byte in merged_ranges:
-            if not quiet:
-                logger.info(f"Downloading bytes {start_byte} to {end_byte}")
-            chunk = download_bytes(
-                s3_client, bucket, grib_key, start_byte, end_byte, quiet=quiet
-            )
-            merged_data.extend(chunk)
-            total_bytes += len(chunk)
+        if verbose and not quiet:
+            for range_start, range_end, _ in range_requests:
+                logger.info(f"Downloading bytes {range_start} to {range_end}")
+        ranges_start_time = time.time()
+
+        # Small ranges can share one multi-range request
+        if multi_range:
+            groups = _group_range_requests(range_requests)
+        else:
+            groups = [[range_request] for range_request in range_requests]
 
-        # Save data
+        # Issue all requests concurrently, each one streams its elements into
+        # their disjoint regions of the output file
         try:
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        except FileNotFoundError:
-            pass
+            max_workers = min(max_range_workers, len(groups))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(
+                        _download_range_group,
+                        download_range,
+                        s3_client,
+                        bucket,
+                        grib_key,
+                        group,
+                        part_path,
+                        quiet=quiet or not verbose,
+                    )
+                    for group in groups
+                ]
+                for future in futures:
+                    future.result()
+            os.replace(part_path, output_path)
+        except Exception:
+            # Do not leave a partially written grib2 file behind
+            os.remove(part_path)
+            raise
 
-        with open(output_path, "wb") as f:
-            f.write(merged_data)
+        if not quiet:
+            ranges_time = time.time() - ranges_start_time
+            logger.info(
+                f"Downloaded {len(range_requests)} byte ranges: {total_bytes / 1024 / 1024:.2f}MB, "
+                f"Time: {ranges_time:.2f}s"
+            )
 
         total_time = time.time() - total_start_time
         avg_speed_mbps = (
@@ -379,6 +1297,7 @@ def download_gfs_data(
         result.file_size_mb = total_bytes / 1024 / 1024
         result.download_time_s = total_time
         result.download_speed_mbs = avg_speed_mbps
+        result.element_offsets = element_offsets
 
         if not quiet:
             logger.success(
@@ -396,6 +1315,232 @@ def download_gfs_data(
         return result
 
 
+def iter_gfs_data(
+    init_dt: datetime,
+    forecast_hour: int,
+    elements: List[Dict],
+    bucket: str = "noaa-gfs-bdp-pds",
+    region: str = "us-east-1",
+    quiet: bool = False,
+    use_idx_cache: bool = True,
+) -> Iterator[Tuple[GribElement, bytes]]:
+    """Download GFS elements and yield each one as soon as it is available
+
+    Unlike download_gfs_data, nothing is written to disk. The byte ranges are
+    downloaded concurrently and every element is yielded with its GRIB2 message
+    as soon as its range completes, so decoding can overlap with the remaining
+    downloads. Elements are yielded in completion order, not request order.
+
+    Args:
+        init_dt (datetime): Datetime object for the initialization time (model start time)
+        forecast_hour (int): Forecast hour (0-384)
+        elements (List[Dict]): List of elements to download, each containing:
+            - name (str): Variable name (e.g., "TMP", "UGRD")
+            - level (str): Level description (e.g., "2 m above ground")
+        bucket (str, optional): S3 bucket name. Defaults to 'noaa-gfs-bdp-pds'
+        region (str, optional): AWS region. Defaults to 'us-east-1'
+        quiet (bool, optional): If True, suppress all log output. Defaults to False
+        use_idx_cache (bool, optional): If True, reuse idx files cached on local
+            disk and cache newly downloaded ones. Defaults to True
+
+    Yields:
+        Tuple[GribElement, bytes]: The element and its GRIB2 message
+
+    Raises:
+        ValueError: If the request is invalid or no element is found
+        botocore.exceptions.ClientError: If there's an error accessing the S3 object
+
+    Example:
+        >>> for elem, data in iter_gfs_data(init_dt, 0, elements):
+        ...     print(elem.variable, elem.level, len(data))
+    """
+    init_dt = _to_utc(init_dt)
+    error_message = _validate_request(init_dt, forecast_hour)
+    if error_message is not None:
+        raise ValueError(error_message)
+
+    grib_key = _build_grib_key(init_dt, forecast_hour)
+    idx_key = f"{grib_key}.idx"
+    s3_client = _get_s3_client(region)
+
+    if not quiet:
+        logger.info(f"Downloading idx file: {idx_key}")
+    cache_path = (
+        _idx_cache_path(bucket, init_dt, forecast_hour) if use_idx_cache else None
+    )
+    grib_idx = GribIdx(download_idx(s3_client, bucket, idx_key, cache_path))
+    selected_elements = grib_idx.find_elements(elements)
+    if not quiet:
+        logger.info(f"Matched {len(selected_elements)}/{len(elements)} elements")
+
+    if not selected_elements:
+        raise ValueError(f"Specified elements not found: {elements}")
+
+    # Drop duplicate matches so each GRIB message is yielded only once
+    unique_elements = list(
+        {(elem.start_byte, elem.end_byte): elem for elem in selected_elements}.values()
+    )
+    byte_ranges = [(elem.start_byte, elem.end_byte) for elem in unique_elements]
+
+    # Lay the elements out back to back as download_gfs_data does, the output
+    # offset of a part then tells which element it belongs to
+    output_offsets = []
+    total_bytes = 0
+    for start_byte, end_byte in byte_ranges:
+        output_offsets.append(total_bytes)
+        total_bytes += end_byte - start_byte
+
+    # Merge nearby ranges and split large spans into sub-ranges, so all
+    # requests run in one pool bounded by MAX_DOWNLOAD_WORKERS
+    range_requests = []
+    for span_start, span_end, members in _merge_byte_ranges(byte_ranges):
+        parts = [(*byte_ranges[i], output_offsets[i]) for i in members]
+        range_requests.extend(_split_span(span_start, span_end, parts))
+
+    if not quiet:
+        logger.info(f"Starting data download: {grib_key}")
+
+    # Elements split across sub-ranges are assembled here until complete
+    buffers: Dict[int, bytearray] = {}
+    remaining = [end_byte - start_byte for start_byte, end_byte in byte_ranges]
+
+    max_workers = min(MAX_DOWNLOAD_WORKERS, len(range_requests))
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    futures = {
+        executor.submit(
+            _get_range, s3_client, bucket, grib_key, range_start, range_end
+        ): (range_start, parts)
+        for range_start, range_end, parts in range_requests
+    }
+    try:
+        for future in as_completed(futures):
+            range_start, parts = futures[future]
+            data = future.result()
+            for part_start, part_end, output_offset in parts:
+                i = bisect_right(output_offsets, output_offset) - 1
+                lo, hi = part_start - range_start, part_end - range_start
+                chunk = data[lo:hi]
+                if len(chunk) == byte_ranges[i][1] - byte_ranges[i][0]:
+                    yield unique_elements[i], chunk
+                    continue
+
+                if i not in buffers:
+                    buffers[i] = bytearray(remaining[i])
+                buffer = buffers[i]
+                lo = output_offset - output_offsets[i]
+                hi = lo + len(chunk)
+                buffer[lo:hi] = chunk
+                remaining[i] -= len(chunk)
+                if remaining[i] == 0:
+                    yield unique_elements[i], bytes(buffers.pop(i))
+    finally:
+        # Stop pending downloads if the caller does not consume every element
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def download_gfs_batch(
+    requests: List[Dict],
+    bucket: str = "noaa-gfs-bdp-pds",
+    region: str = "us-east-1",
+    max_workers: int = 2,
+    quiet: bool = False,
+    use_idx_cache: bool = True,
+) -> List[GFSDownloadResult]:
+    """Download GFS data for several times and forecast hours
+
+    The idx files of upcoming requests are prefetched in the background while
+    earlier requests are still downloading their byte ranges, which takes the
+    idx round-trip off the critical path of every request but the first.
+
+    Args:
+        requests (List[Dict]): List of download requests, each containing the
+            ``init_dt``, ``forecast_hour``, ``elements`` and ``output_path``
+            arguments of download_gfs_data
+        bucket (str, optional): S3 bucket name. Defaults to 'noaa-gfs-bdp-pds'
+        region (str, optional): AWS region. Defaults to 'us-east-1'
+        max_workers (int, optional): Number of requests downloaded at the same
+            time, at most MAX_POOL_CONNECTIONS // 2. The range requests of the
+            concurrent downloads and the idx prefetches share the connection
+            pool of the S3 client, so each download gets a proportional share
+            of it. Defaults to 2
+        quiet (bool, optional): If True, suppress all log output. Defaults to False
+        use_idx_cache (bool, optional): If True, reuse idx files cached on local
+            disk and cache newly downloaded ones. Defaults to True
+
+    Returns:
+        List[GFSDownloadResult]: Download results in the order of ``requests``
+
+    Example:
+        >>> results = download_gfs_batch([
+        ...     {
+        ...         "init_dt": datetime(2025, 1, 1, tzinfo=timezone.utc),
+        ...         "forecast_hour": fh,
+        ...         "elements": [{"name": "TMP", "level": "2 m above ground"}],
+        ...         "output_path": f"gfs_f{fh:03d}.grib2",
+        ...     }
+        ...     for fh in range(0, 25, 3)
+        ... ])
+    """
+    s3_client = _get_s3_client(region)
+    idx_futures: List[Optional[Future]] = []
+    download_futures: List[Future] = []
+
+    # Keep the idx prefetches and the range requests of all concurrent
+    # downloads within the connection pool, so no connection is discarded
+    max_workers = max(1, min(max_workers, MAX_POOL_CONNECTIONS // 2))
+    max_range_workers = min(
+        MAX_DOWNLOAD_WORKERS, (MAX_POOL_CONNECTIONS - max_workers) // max_workers
+    )
+
+    with ThreadPoolExecutor(max_workers=max_workers) as idx_executor:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for i, request in enumerate(requests):
+                # Keep the idx files of the next requests downloading ahead
+                while len(idx_futures) < min(i + 1 + IDX_LOOKAHEAD, len(requests)):
+                    next_request = requests[len(idx_futures)]
+                    next_dt = _to_utc(next_request["init_dt"])
+                    next_hour = next_request["forecast_hour"]
+                    # Invalid requests fail in _download_gfs_data without an idx
+                    if _validate_request(next_dt, next_hour) is not None:
+                        idx_futures.append(None)
+                        continue
+                    idx_key = _build_grib_key(next_dt, next_hour) + ".idx"
+                    cache_path = (
+                        _idx_cache_path(bucket, next_dt, next_hour)
+                        if use_idx_cache
+                        else None
+                    )
+                    idx_futures.append(
+                        idx_executor.submit(
+                            download_idx, s3_client, bucket, idx_key, cache_path
+                        )
+                    )
+
+                # Bound the number of requests in flight
+                if i >= max_workers:
+                    download_futures[i - max_workers].result()
+
+                download_futures.append(
+                    executor.submit(
+                        _download_gfs_data,
+                        request["init_dt"],
+                        request["forecast_hour"],
+                        request["elements"],
+                        request["output_path"],
+                        bucket=bucket,
+                        region=region,
+                        quiet=quiet,
+                        use_idx_cache=use_idx_cache,
+                        idx_future=idx_futures[i],
+                        max_range_workers=max_range_workers,
+                    )
+                )
+
+            return [future.result() for future in download_futures]
+
+
 if __name__ == "__main__":
     # Example usage
     elements = [
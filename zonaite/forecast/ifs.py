@@ -40,12 +40,11 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Tuple
 
-import boto3
-from botocore import UNSIGNED
-from botocore.config import Config
 from loguru import logger
 import json
 
+from ._s3 import _get_s3_client
+
 
 @dataclass
 class IFSDownloadResult:
@@ -164,7 +163,6 @@ class GribIdx:
                 if (elem.param == target["param"] and 
                     elem.levtype == target["levtype"] and
                     str(elem.levelist) == str(target.get("levelist"))):  # 确保类型一致
-                    logger.info(f"Found match: {elem.param} @ {elem.levtype} level {elem.levelist}")
                     result.append(elem)
         return result
 
@@ -325,12 +323,8 @@ def download_ifs_data(
         grib_key = f"{date_str}/{cycle_str}z/ifs/0p25/oper/{date_str}{cycle_str}0000-{forecast_hour}h-oper-fc.grib2"
         idx_key = grib_key.replace(".grib2", ".index")
 
-        # Create S3 client with anonymous access
-        s3_client = boto3.client(
-            "s3",
-            region_name=region,
-            config=Config(signature_version=UNSIGNED, s3={"addressing_style": "path"}),
-        )
+        # Reuse the cached anonymous S3 client and its keep-alive connections
+        s3_client = _get_s3_client(region)
 
         # Download and parse idx file
         logger.info(f"Downloading idx file: {idx_key}")
@@ -340,6 +334,7 @@ def download_ifs_data(
         # Parse idx file and find elements
         grib_idx = GribIdx(idx_content)
         selected_elements = grib_idx.find_elements(elements)
+        logger.info(f"Matched {len(selected_elements)}/{len(elements)} elements")
 
         if not selected_elements:
             result.error_message = f"Specified elements not found: {elements}"
@@ -359,7 +354,9 @@ def download_ifs_data(
             total_bytes += len(chunk)
 
         # Save data
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
         with open(output_path, "wb") as f:
             f.write(merged_data)
 